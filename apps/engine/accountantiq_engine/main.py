@@ -2,22 +2,23 @@
 
 from __future__ import annotations
 
+import hashlib
 from io import StringIO
 from typing import Iterable, Tuple
 
 from accountantiq_core import (
     BankCsvParser,
+    LruCache,
     ReviewStore,
     SageHistoryParser,
     add_rule,
     append_rule,
-    approved_items,
     create_rule_from_transaction,
     export_review,
     list_profiles,
+    load_compiled_rules,
     load_profile,
     load_rules,
-    match_rule,
     save_profile,
     suggest_for_transactions,
 )
@@ -35,8 +36,10 @@ from accountantiq_schemas import (
     ReviewImportRequest,
     ReviewItem,
     ReviewQueueResponse,
+    ReviewStatus,
     RuleCreateRequest,
     RuleDefinition,
+    SageHistoryEntry,
     Suggestion,
     SuggestionRequest,
     SuggestionResponse,
@@ -44,38 +47,51 @@ from accountantiq_schemas import (
 from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
+from .responses import ModelJSONResponse
+
 AUTO_RULE_CONFIDENCE_THRESHOLD = 0.85
+HISTORY_CACHE_SIZE = 16
 
 router = APIRouter(tags=["engine"])
 
+_history_cache: LruCache[str, tuple[SageHistoryEntry, ...]] = LruCache(
+    maxsize=HISTORY_CACHE_SIZE
+)
+
+
+def _parse_history_csv(history_csv: str) -> list[SageHistoryEntry]:
+    """Parse Sage history CSV content, reusing rows for repeated uploads."""
+    digest = hashlib.sha1(history_csv.encode("utf-8")).hexdigest()
+    entries = _history_cache.get(digest)
+    if entries is None:
+        entries = tuple(SageHistoryParser().parse(StringIO(history_csv)))
+        _history_cache.put(digest, entries)
+    return list(entries)
+
 
 def _apply_rules(
     client_slug: str,
     txns: list[BankTxn],
     suggestions: list[Suggestion],
 ) -> list[Suggestion]:
-    rules = load_rules(client_slug)
-    if not rules:
+    rules = load_compiled_rules(client_slug)
+    if not rules.rules:
         return suggestions
-    updated: list[Suggestion] = []
-    for txn, suggestion in zip(txns, suggestions, strict=True):
-        rule = match_rule(rules, txn)
+    updated = list(suggestions)
+    for index, (txn, suggestion) in enumerate(zip(txns, suggestions, strict=True)):
+        rule = rules.match(txn)
         if rule is None:
-            updated.append(suggestion)
             continue
         explanations = [
             f"Rule '{rule.name}' applied (pattern: {rule.pattern})",
             *suggestion.explanations,
         ]
-        updated.append(
-            suggestion.model_copy(
-                update={
-                    "nominal_suggested": rule.nominal,
-                    "tax_code_suggested": rule.tax_code,
-                    "confidence": max(suggestion.confidence, 0.95),
-                    "explanations": explanations,
-                }
-            )
+        updated[index] = Suggestion(
+            txn_id=suggestion.txn_id,
+            nominal_suggested=rule.nominal,
+            tax_code_suggested=rule.tax_code,
+            confidence=max(suggestion.confidence, 0.95),
+            explanations=explanations,
         )
     return updated
 
@@ -118,29 +134,29 @@ def _auto_generate_rules(
 
 
 @router.post("/suggest", response_model=SuggestionResponse)
-def suggest_codes(payload: SuggestionRequest) -> SuggestionResponse:
+def suggest_codes(payload: SuggestionRequest) -> ModelJSONResponse:
     """Return nominal/tax suggestions for the provided transactions."""
     suggestions = suggest_for_transactions(payload.transactions, payload.history)
-    return SuggestionResponse(suggestions=suggestions)
+    return ModelJSONResponse(SuggestionResponse(suggestions=suggestions))
 
 
 @router.post("/suggest/from-csv", response_model=CsvSuggestionResponse)
-def suggest_from_csv(payload: CsvSuggestionRequest) -> CsvSuggestionResponse:
+def suggest_from_csv(payload: CsvSuggestionRequest) -> ModelJSONResponse:
     """Parse CSV content and return suggestions with the normalised rows."""
     bank_parser = BankCsvParser()
-    history_parser = SageHistoryParser()
     bank_rows = bank_parser.parse(StringIO(payload.bank_csv))
-    history_rows = history_parser.parse(StringIO(payload.history_csv))
+    history_rows = _parse_history_csv(payload.history_csv)
     suggestions = suggest_for_transactions(bank_rows, history_rows)
-    return CsvSuggestionResponse(transactions=bank_rows, suggestions=suggestions)
+    return ModelJSONResponse(
+        CsvSuggestionResponse(transactions=bank_rows, suggestions=suggestions)
+    )
 
 
 @router.post("/review/import", response_model=ReviewQueueResponse)
-def import_review_queue(payload: ReviewImportRequest) -> ReviewQueueResponse:
+def import_review_queue(payload: ReviewImportRequest) -> ModelJSONResponse:
     bank_parser = BankCsvParser()
-    history_parser = SageHistoryParser()
     bank_rows = bank_parser.parse(StringIO(payload.bank_csv))
-    history_rows = history_parser.parse(StringIO(payload.history_csv))
+    history_rows = _parse_history_csv(payload.history_csv)
     suggestions = suggest_for_transactions(bank_rows, history_rows)
     suggestions = _apply_rules(payload.client_slug, bank_rows, suggestions)
 
@@ -149,18 +165,20 @@ def import_review_queue(payload: ReviewImportRequest) -> ReviewQueueResponse:
         created, _ = _auto_generate_rules(payload.client_slug, bank_rows, suggestions)
         rules_created = created
 
-    store = ReviewStore(payload.client_slug)
+    store = ReviewStore.for_client(payload.client_slug)
     items = store.import_batch(bank_rows, suggestions, reset=payload.reset)
-    return ReviewQueueResponse(
-        items=items,
-        rules_created=rules_created if payload.auto_rules else None,
+    return ModelJSONResponse(
+        ReviewQueueResponse(
+            items=items,
+            rules_created=rules_created if payload.auto_rules else None,
+        )
     )
 
 
 @router.get("/review/{client_slug}/queue", response_model=ReviewQueueResponse)
-def list_review_queue(client_slug: str) -> ReviewQueueResponse:
-    store = ReviewStore(client_slug)
-    return ReviewQueueResponse(items=store.list_items())
+def list_review_queue(client_slug: str) -> ModelJSONResponse:
+    store = ReviewStore.for_client(client_slug)
+    return ModelJSONResponse(ReviewQueueResponse(items=store.list_items()))
 
 
 @router.post("/review/{client_slug}/items/{txn_id}/approve", response_model=ReviewItem)
@@ -169,7 +187,7 @@ def approve_item(
     txn_id: str,
     payload: ApprovalRequest | None = None,
 ) -> ReviewItem:
-    store = ReviewStore(client_slug)
+    store = ReviewStore.for_client(client_slug)
     try:
         return store.approve(txn_id, payload)
     except KeyError as exc:  # pragma: no cover - defensive branch
@@ -182,7 +200,7 @@ def override_item(
     txn_id: str,
     payload: OverrideRequest,
 ) -> ReviewItem:
-    store = ReviewStore(client_slug)
+    store = ReviewStore.for_client(client_slug)
     try:
         return store.override(txn_id, payload)
     except KeyError as exc:  # pragma: no cover - defensive branch
@@ -202,7 +220,7 @@ def create_rule(client_slug: str, payload: RuleCreateRequest) -> list[RuleDefini
 
 @router.post("/review/{client_slug}/auto-rules", response_model=AutoRulesResponse)
 def auto_rules(client_slug: str) -> AutoRulesResponse:
-    store = ReviewStore(client_slug)
+    store = ReviewStore.for_client(client_slug)
     items = store.list_items()
     if not items:
         return AutoRulesResponse(created=0, skipped=0)
@@ -231,8 +249,8 @@ def export_review_items(
     client_slug: str,
     payload: ExportRequest | None = None,
 ) -> ExportResponse:
-    store = ReviewStore(client_slug)
-    items = approved_items(store.list_items())
+    store = ReviewStore.for_client(client_slug)
+    items = store.list_by_status(ReviewStatus.APPROVED, ReviewStatus.OVERRIDDEN)
     if not items:
         raise HTTPException(status_code=400, detail="No approved items to export")
     profile_name = payload.profile_name if payload else "default"
@@ -243,7 +261,11 @@ def export_review_items(
 
 def create_app() -> FastAPI:
     """Build and configure the FastAPI application."""
-    app = FastAPI(title="AccountantIQ Engine", version="0.1.0")
+    app = FastAPI(
+        title="AccountantIQ Engine",
+        version="0.1.0",
+        default_response_class=ModelJSONResponse,
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -0,0 +1,25 @@
+"""Response classes for the AccountantIQ engine."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response that lets pydantic-core serialise models directly.
+
+    Returning one of these from a route bypasses FastAPI's response-model
+    re-validation and `jsonable_encoder` walk; other content falls back to the
+    standard JSON encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return super().render(content)
+
+
+__all__ = ["ModelJSONResponse"]
@@ -4,16 +4,14 @@ from __future__ import annotations
 
 import csv
 import io
-import shutil
 from pathlib import Path
 
-from accountantiq_core import BankCsvParser, SageHistoryParser
+from accountantiq_core import BankCsvParser, SageHistoryParser, remove_client
 from accountantiq_engine.main import app
 from fastapi.testclient import TestClient
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 EXAMPLES_DIR = REPO_ROOT / "examples"
-CLIENTS_ROOT = REPO_ROOT / "data" / "clients"
 
 client = TestClient(app)
 bank_parser = BankCsvParser()
@@ -127,9 +125,7 @@ def _sample_history_csv() -> str:
 
 
 def _reset_client(client_slug: str) -> None:
-    root = CLIENTS_ROOT / client_slug
-    if root.exists():
-        shutil.rmtree(root, ignore_errors=True)
+    remove_client(client_slug)
 
 
 def test_suggest_endpoint_returns_suggestions() -> None:
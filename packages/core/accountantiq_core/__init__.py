@@ -1,21 +1,72 @@
-"""Core utilities for AccountantIQ."""
-
-from .exporter import export_review
-from .matching import VendorMatcher, suggest_for_transactions
-from .parsers import BankCsvParser, SageHistoryParser, clean_description
-from .profile import list_profiles, load_profile, save_profile
-from .review import ReviewStore, approved_items, pending_items
-from .rules import (
-    add_rule,
-    append_rule,
-    create_rule_from_transaction,
-    load_rules,
-    match_rule,
-)
-from .workspace import client_root, inputs_path, outputs_path, workspace_path
+"""Core utilities for AccountantIQ.
+
+Public names are resolved lazily (PEP 562) so importing the package does not
+pull in YAML, SQLite or RapidFuzz until the helper that needs them is used.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cache import LruCache
+    from .exporter import export_review
+    from .matching import VendorMatcher, suggest_for_transactions
+    from .parsers import BankCsvParser, SageHistoryParser, clean_description
+    from .profile import list_profiles, load_profile, save_profile
+    from .review import ReviewStore, approved_items, pending_items
+    from .rules import (
+        CompiledRules,
+        add_rule,
+        append_rule,
+        compile_rules,
+        create_rule_from_transaction,
+        load_compiled_rules,
+        load_rules,
+        match_rule,
+    )
+    from .workspace import (
+        client_root,
+        inputs_path,
+        outputs_path,
+        remove_client,
+        workspace_path,
+    )
+
+_EXPORTS: dict[str, str] = {
+    "BankCsvParser": ".parsers",
+    "CompiledRules": ".rules",
+    "LruCache": ".cache",
+    "ReviewStore": ".review",
+    "SageHistoryParser": ".parsers",
+    "VendorMatcher": ".matching",
+    "add_rule": ".rules",
+    "append_rule": ".rules",
+    "approved_items": ".review",
+    "clean_description": ".parsers",
+    "client_root": ".workspace",
+    "compile_rules": ".rules",
+    "create_rule_from_transaction": ".rules",
+    "export_review": ".exporter",
+    "inputs_path": ".workspace",
+    "list_profiles": ".profile",
+    "load_compiled_rules": ".rules",
+    "load_profile": ".profile",
+    "load_rules": ".rules",
+    "match_rule": ".rules",
+    "outputs_path": ".workspace",
+    "pending_items": ".review",
+    "remove_client": ".workspace",
+    "save_profile": ".profile",
+    "suggest_for_transactions": ".matching",
+    "workspace_path": ".workspace",
+}
 
 __all__ = [
     "BankCsvParser",
+    "CompiledRules",
+    "LruCache",
     "SageHistoryParser",
     "VendorMatcher",
     "add_rule",
@@ -23,9 +74,11 @@ __all__ = [
     "approved_items",
     "clean_description",
     "client_root",
+    "compile_rules",
     "export_review",
     "inputs_path",
     "list_profiles",
+    "load_compiled_rules",
     "load_profile",
     "load_rules",
     "match_rule",
@@ -35,5 +88,20 @@ __all__ = [
     "save_profile",
     "suggest_for_transactions",
     "outputs_path",
+    "remove_client",
     "workspace_path",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    # Loaded submodules and dunders stay visible next to the lazy exports.
+    return sorted({*globals(), *__all__})
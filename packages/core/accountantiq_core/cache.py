@@ -0,0 +1,80 @@
+"""Small in-process caches shared by the core helpers."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Identifies one version of a file on disk: (path, mtime_ns, size).
+FileKey = tuple[str, int, int]
+
+
+class LruCache(Generic[K, V]):
+    """Thread-safe least-recently-used mapping with a fixed capacity.
+
+    `on_evict`, if given, is called with every value the cache drops, whether
+    it was evicted, replaced or cleared, after the cache lock is released.
+    """
+
+    def __init__(
+        self, maxsize: int, on_evict: Callable[[V], None] | None = None
+    ) -> None:
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        dropped: list[V] = []
+        with self._lock:
+            previous = self._data.get(key)
+            if previous is not None and previous is not value:
+                dropped.append(previous)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                dropped.append(self._data.popitem(last=False)[1])
+        self._evicted(dropped)
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            value = self._data.pop(key, None)
+        self._evicted([] if value is None else [value])
+
+    def clear(self) -> None:
+        with self._lock:
+            dropped = list(self._data.values())
+            self._data.clear()
+        self._evicted(dropped)
+
+    def _evicted(self, values: list[V]) -> None:
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def file_key(path: Path) -> FileKey | None:
+    """Return the cache key for the file's current version, or None if absent."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+__all__ = ["FileKey", "LruCache", "file_key"]
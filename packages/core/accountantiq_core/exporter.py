@@ -3,39 +3,51 @@
 from __future__ import annotations
 
 import csv
-from datetime import datetime
-from typing import Callable
+import secrets
+import time
+from functools import lru_cache
+from typing import Callable, cast
 
 from accountantiq_schemas import ProfileDefinition, ReviewItem
 
 from .workspace import outputs_path
 
-_FIELD_RESOLVERS: dict[str, Callable[[ReviewItem], str]] = {
-    "transaction_id": lambda item: item.txn.id,
-    "date": lambda item: item.txn.date.isoformat(),
-    "details": lambda item: item.txn.description_raw,
-    "description": lambda item: item.txn.description_raw,
-    "account_id": lambda item: item.txn.account_id,
-    "direction": lambda item: item.txn.direction,
-    "nominal_code": lambda item: (
-        item.nominal_final or item.suggestion.nominal_suggested or ""
-    ),
-    "tax_code": lambda item: (
-        item.tax_code_final or item.suggestion.tax_code_suggested or ""
-    ),
-    "net_amount": lambda item: f"{item.txn.amount:.2f}",
-    "confidence": lambda item: f"{int(round(item.suggestion.confidence * 100))}",
-    "status": lambda item: item.status.value,
+RowBuilder = Callable[[ReviewItem], list[str]]
+
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# Python expressions over a review item ``i``, one per supported column field.
+# Unknown fields export as blank cells.
+_FIELD_EXPRESSIONS: dict[str, str] = {
+    "transaction_id": "i.txn.id",
+    "date": "i.txn.date.isoformat()",
+    "details": "i.txn.description_raw",
+    "description": "i.txn.description_raw",
+    "account_id": "i.txn.account_id",
+    "direction": "i.txn.direction",
+    "nominal_code": '(i.nominal_final or i.suggestion.nominal_suggested or "")',
+    "tax_code": '(i.tax_code_final or i.suggestion.tax_code_suggested or "")',
+    "net_amount": 'f"{i.txn.amount:.2f}"',
+    "confidence": 'f"{int(round(i.suggestion.confidence * 100))}"',
+    "status": "i.status.value",
 }
 
 
+@lru_cache(maxsize=64)
+def _compile_row_fn(fields: tuple[str, ...]) -> RowBuilder:
+    """Generate a row builder with the column order baked in."""
+    cells = ", ".join(_FIELD_EXPRESSIONS.get(name, '""') for name in fields)
+    namespace: dict[str, object] = {}
+    exec(f"def _row(i):\n    return [{cells}]\n", {}, namespace)
+    return cast(RowBuilder, namespace["_row"])
+
+
+def _row_fn(profile: ProfileDefinition) -> RowBuilder:
+    return _compile_row_fn(tuple(column.field for column in profile.columns))
+
+
 def build_row(item: ReviewItem, profile: ProfileDefinition) -> list[str]:
-    row: list[str] = []
-    for column in profile.columns:
-        resolver = _FIELD_RESOLVERS.get(column.field)
-        value = resolver(item) if resolver else ""
-        row.append(value)
-    return row
+    return _row_fn(profile)(item)
 
 
 def export_review(
@@ -44,14 +56,17 @@ def export_review(
     profile: ProfileDefinition,
 ) -> str:
     output_dir = outputs_path(client_slug)
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    filename = f"sage_import_{timestamp}.csv"
+    # A random suffix keeps exports made within the same second apart.
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+    filename = f"sage_import_{timestamp}_{secrets.token_hex(3)}.csv"
     destination = output_dir / filename
 
-    with destination.open("w", encoding="utf-8", newline="") as handle:
+    row = _row_fn(profile)
+    with destination.open(
+        "w", encoding="utf-8", newline="", buffering=_EXPORT_BUFFER_SIZE
+    ) as handle:
         writer = csv.writer(handle)
         writer.writerow([column.header for column in profile.columns])
-        for item in items:
-            writer.writerow(build_row(item, profile))
+        writer.writerows(map(row, items))
 
     return str(destination)
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
+import pickle
+from array import array
 from collections import Counter
 from dataclasses import dataclass, field
+from functools import lru_cache
 from statistics import median
 from typing import Sequence
 
 from accountantiq_schemas import BankTxn, Direction, SageHistoryEntry, Suggestion
-from rapidfuzz import fuzz, process
 
+from .cache import LruCache
 from .parsers import clean_description
 
 _MIN_FUZZY_SCORE = 60
@@ -17,6 +21,9 @@ _ALIAS_SCORE_WEIGHT = 0.6
 _DIRECTION_BONUS = 0.2
 _AMOUNT_BONUS = 0.1
 _AMOUNT_MATCH_CONFIDENCE = 0.65
+_AMOUNT_TOLERANCE_RATIO = 0.15
+_MIN_AMOUNT_TOLERANCE = 1.0
+_MATCHER_CACHE_SIZE = 64
 
 
 @dataclass(slots=True)
@@ -28,15 +35,43 @@ class VendorProfile:
     nominal_counts: Counter[str] = field(default_factory=Counter)
     tax_counts: Counter[str] = field(default_factory=Counter)
     direction_counts: Counter[Direction] = field(default_factory=Counter)
-    amounts: list[float] = field(default_factory=list)
+    amounts: array[float] = field(default_factory=lambda: array("d"))
+    nominal_top: str | None = None
+    tax_top: str | None = None
+    direction_top: Direction | None = None
+    amount_median: float | None = None
+    amount_tolerance: float | None = None
+    _nominal_codes: list[str] = field(default_factory=list, repr=False)
+    _tax_codes: list[str] = field(default_factory=list, repr=False)
+    _directions: list[Direction] = field(default_factory=list, repr=False)
 
     def register_entry(self, entry: SageHistoryEntry) -> None:
-        self.nominal_counts[entry.nominal_code] += 1
-        self.tax_counts[entry.tax_code] += 1
-        direction: Direction = "debit" if entry.amount < 0 else "credit"
-        self.direction_counts[direction] += 1
+        self._nominal_codes.append(entry.nominal_code)
+        self._tax_codes.append(entry.tax_code)
+        self._directions.append("debit" if entry.amount < 0 else "credit")
         self.amounts.append(abs(entry.amount))
 
+    def finalize(self) -> None:
+        """Count registered entries and cache the dominant signals.
+
+        Counting in bulk keeps `register_entry` to plain appends; the counts
+        and `dominant_*` helpers reflect registered entries only after this.
+        """
+        self.nominal_counts.update(self._nominal_codes)
+        self.tax_counts.update(self._tax_codes)
+        self.direction_counts.update(self._directions)
+        self._nominal_codes.clear()
+        self._tax_codes.clear()
+        self._directions.clear()
+        self.nominal_top = self.dominant_nominal()
+        self.tax_top = self.dominant_tax_code()
+        self.direction_top = self.dominant_direction()
+        self.amount_median = self.amount_summary()
+        if self.amount_median is not None:
+            self.amount_tolerance = max(
+                _MIN_AMOUNT_TOLERANCE, self.amount_median * _AMOUNT_TOLERANCE_RATIO
+            )
+
     def dominant_nominal(self) -> str | None:
         if not self.nominal_counts:
             return None
@@ -64,10 +99,23 @@ class AmountProfile:
 
     nominal_counts: Counter[str] = field(default_factory=Counter)
     tax_counts: Counter[str] = field(default_factory=Counter)
+    nominal_top: str | None = None
+    tax_top: str | None = None
+    _nominal_codes: list[str] = field(default_factory=list, repr=False)
+    _tax_codes: list[str] = field(default_factory=list, repr=False)
 
     def register_entry(self, entry: SageHistoryEntry) -> None:
-        self.nominal_counts[entry.nominal_code] += 1
-        self.tax_counts[entry.tax_code] += 1
+        self._nominal_codes.append(entry.nominal_code)
+        self._tax_codes.append(entry.tax_code)
+
+    def finalize(self) -> None:
+        """Count the registered entries; see `VendorProfile.finalize`."""
+        self.nominal_counts.update(self._nominal_codes)
+        self.tax_counts.update(self._tax_codes)
+        self._nominal_codes.clear()
+        self._tax_codes.clear()
+        self.nominal_top = self.dominant_nominal()
+        self.tax_top = self.dominant_tax_code()
 
     def dominant_nominal(self) -> str | None:
         if not self.nominal_counts:
@@ -80,14 +128,25 @@ class AmountProfile:
         return self.tax_counts.most_common(1)[0][0]
 
 
-def _generate_aliases(seed: str) -> set[str]:
+# Amounts are keyed in whole pence so lookups hash an int rather than a float.
+AmountKey = tuple[Direction, int]
+
+
+def _amount_key(direction: Direction, amount: float) -> AmountKey:
+    return direction, round(abs(amount) * 100)
+
+
+@lru_cache(maxsize=4096)
+def _generate_aliases(seed: str) -> frozenset[str]:
+    # Repeat vendors hand in the same seed many times; the result is frozen so
+    # the cached value can be shared between profiles.
     tokens = [token for token in seed.split() if token]
     variants = {seed}
     if len(tokens) >= 2:
         variants.add(" ".join(tokens[:2]))
     if len(tokens) >= 3:
         variants.add(" ".join(tokens[:3]))
-    return {variant for variant in variants if variant}
+    return frozenset(variant for variant in variants if variant)
 
 
 class VendorMatcher:
@@ -100,34 +159,92 @@ class VendorMatcher:
             for alias in profile.aliases:
                 self._alias_lookup[alias] = profile
         self._aliases: tuple[str, ...] = tuple(self._alias_lookup.keys())
+        self._alias_postings: dict[str, list[int]] = {}
+        for index, alias in enumerate(self._aliases):
+            for token in frozenset(alias.split()):
+                self._alias_postings.setdefault(token, []).append(index)
 
     def suggest(self, txn: BankTxn) -> Suggestion:
         if not self._profiles:
-            return Suggestion(
-                txn_id=txn.id,
-                confidence=0.0,
-                explanations=["No vendor history available"],
-            )
+            return self._no_history(txn)
+        match_alias, match_score = self._match_alias(self._query_for(txn))
+        return self._score(txn, match_alias, match_score)
 
-        amount_key = (txn.direction, round(abs(txn.amount), 2))
-        cleaned_description = txn.description_clean or clean_description(
-            txn.description_raw
-        )
-        match_alias = (
-            cleaned_description if cleaned_description in self._alias_lookup else None
+    def suggest_many(self, transactions: Sequence[BankTxn]) -> list[Suggestion]:
+        """Score a batch, running the fuzzy lookup once per distinct query."""
+        if not self._profiles:
+            return [self._no_history(txn) for txn in transactions]
+        queries = [self._query_for(txn) for txn in transactions]
+        matches = {query: self._match_alias(query) for query in dict.fromkeys(queries)}
+        return [
+            self._score(txn, *matches[query])
+            for txn, query in zip(transactions, queries, strict=True)
+        ]
+
+    @staticmethod
+    def _no_history(txn: BankTxn) -> Suggestion:
+        return Suggestion(
+            txn_id=txn.id,
+            confidence=0.0,
+            explanations=["No vendor history available"],
         )
-        match_score = 100 if match_alias else 0
 
-        if not match_alias and self._aliases:
-            result = process.extractOne(
+    @staticmethod
+    def _query_for(txn: BankTxn) -> str:
+        return txn.description_clean or clean_description(txn.description_raw)
+
+    def _match_alias(self, cleaned_description: str) -> tuple[str | None, int]:
+        if cleaned_description in self._alias_lookup:
+            return cleaned_description, 100
+        if not self._aliases:
+            return None, 0
+        # Deferred so importing the package does not load RapidFuzz up front.
+        from rapidfuzz import fuzz, process
+
+        # Scores under _MIN_FUZZY_SCORE are discarded by _score anyway, and
+        # RapidFuzz's cutoff is inclusive, so it can drop them up front.
+        score_cutoff = float(_MIN_FUZZY_SCORE)
+        candidates = self._token_candidates(cleaned_description)
+        if candidates:
+            seed = process.extractOne(
                 cleaned_description,
-                self._aliases,
+                [self._aliases[index] for index in candidates],
                 scorer=fuzz.token_set_ratio,
+                score_cutoff=score_cutoff,
             )
-            if result is not None:
-                match_alias = result[0]
-                match_score = int(result[1] or 0)
+            if seed is not None:
+                # Aliases sharing no token can never score 100, and candidates
+                # keep alias order, so a perfect seed is the overall winner.
+                if seed[1] >= 100:
+                    return seed[0], 100
+                # Otherwise the seed bounds the full scan; an alias tying it
+                # earlier in alias order still clears the inclusive cutoff.
+                score_cutoff = max(seed[1], score_cutoff)
+        result = process.extractOne(
+            cleaned_description,
+            self._aliases,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=score_cutoff,
+        )
+        if result is None:
+            return None, 0
+        return result[0], int(result[1] or 0)
+
+    def _token_candidates(self, cleaned_description: str) -> list[int]:
+        """Return indexes of aliases sharing a token with the description."""
+        postings = self._alias_postings
+        return sorted(
+            {
+                index
+                for token in frozenset(cleaned_description.split())
+                for index in postings.get(token, ())
+            }
+        )
 
+    def _score(
+        self, txn: BankTxn, match_alias: str | None, match_score: int
+    ) -> Suggestion:
+        amount_key = _amount_key(txn.direction, txn.amount)
         if match_alias is None or match_score < _MIN_FUZZY_SCORE:
             amount_suggestion = self._suggest_from_amount(txn, amount_key)
             if amount_suggestion is not None:
@@ -149,7 +266,7 @@ class VendorMatcher:
                 f"Fuzzy vendor match '{profile.vendor_key}' with score {match_score}"
             )
 
-        dominant_direction = profile.dominant_direction()
+        dominant_direction = profile.direction_top
         if dominant_direction is not None:
             if txn.direction == dominant_direction:
                 confidence += _DIRECTION_BONUS
@@ -163,9 +280,9 @@ class VendorMatcher:
                     f"{txn.direction} and history {dominant_direction}"
                 )
 
-        amount_median = profile.amount_summary()
-        if amount_median is not None:
-            tolerance = max(1.0, amount_median * 0.15)
+        amount_median = profile.amount_median
+        tolerance = profile.amount_tolerance
+        if amount_median is not None and tolerance is not None:
             delta = abs(abs(txn.amount) - amount_median)
             if delta <= tolerance:
                 confidence += _AMOUNT_BONUS
@@ -179,15 +296,15 @@ class VendorMatcher:
                     f"{amount_median:.2f} by {delta:.2f} (tol {tolerance:.2f})"
                 )
 
-        nominal = profile.dominant_nominal()
-        tax_code = profile.dominant_tax_code()
+        nominal = profile.nominal_top
+        tax_code = profile.tax_top
 
         amount_profile = self._amount_profiles.get(amount_key)
         if nominal is None and amount_profile is not None:
-            fallback_nominal = amount_profile.dominant_nominal()
+            fallback_nominal = amount_profile.nominal_top
             if fallback_nominal is not None:
                 nominal = fallback_nominal
-                fallback_tax = amount_profile.dominant_tax_code()
+                fallback_tax = amount_profile.tax_top
                 if fallback_tax is not None:
                     tax_code = fallback_tax
                 explanations.append(
@@ -206,17 +323,14 @@ class VendorMatcher:
             explanations=explanations,
         )
 
-    def suggest_many(self, transactions: Sequence[BankTxn]) -> list[Suggestion]:
-        return [self.suggest(txn) for txn in transactions]
-
     def _suggest_from_amount(
-        self, txn: BankTxn, amount_key: tuple[Direction, float]
+        self, txn: BankTxn, amount_key: AmountKey
     ) -> Suggestion | None:
         profile = self._amount_profiles.get(amount_key)
         if profile is None:
             return None
-        nominal = profile.dominant_nominal()
-        tax_code = profile.dominant_tax_code()
+        nominal = profile.nominal_top
+        tax_code = profile.tax_top
         if nominal is None and tax_code is None:
             return None
         explanation = (
@@ -234,39 +348,83 @@ class VendorMatcher:
     @staticmethod
     def _build_profiles(
         history: Sequence[SageHistoryEntry],
-    ) -> tuple[dict[str, VendorProfile], dict[tuple[Direction, float], AmountProfile]]:
-        profiles: dict[str, VendorProfile] = {}
-        amount_profiles: dict[tuple[Direction, float], AmountProfile] = {}
+    ) -> tuple[dict[str, VendorProfile], dict[AmountKey, AmountProfile]]:
+        # Group entries per vendor in first-seen order so each profile is built
+        # in one go; amount profiles are registered in history order.
+        grouped: dict[str, list[SageHistoryEntry]] = {}
+        amount_profiles: dict[AmountKey, AmountProfile] = {}
         for entry in history:
             base = entry.vendor_hint or entry.description_clean
             cleaned = clean_description(base)
             if not cleaned:
                 continue
-            profile = profiles.get(cleaned)
-            if profile is None:
-                profile = VendorProfile(vendor_key=cleaned)
-                profiles[cleaned] = profile
-            profile.aliases.update(_generate_aliases(cleaned))
-            profile.aliases.add(entry.description_clean)
-            if entry.vendor_hint:
-                profile.aliases.update(_generate_aliases(entry.vendor_hint))
-            profile.register_entry(entry)
+            entries = grouped.get(cleaned)
+            if entries is None:
+                grouped[cleaned] = [entry]
+            else:
+                entries.append(entry)
 
             direction: Direction = "debit" if entry.amount < 0 else "credit"
-            key = (direction, round(abs(entry.amount), 2))
+            key = _amount_key(direction, entry.amount)
             amount_profile = amount_profiles.get(key)
             if amount_profile is None:
                 amount_profile = AmountProfile()
                 amount_profiles[key] = amount_profile
             amount_profile.register_entry(entry)
+
+        profiles: dict[str, VendorProfile] = {}
+        for cleaned, entries in grouped.items():
+            profile = VendorProfile(vendor_key=cleaned)
+            aliases = profile.aliases
+            aliases.update(_generate_aliases(cleaned))
+            for entry in entries:
+                aliases.add(entry.description_clean)
+                if entry.vendor_hint:
+                    aliases.update(_generate_aliases(entry.vendor_hint))
+                profile.register_entry(entry)
+            profile.finalize()
+            profiles[cleaned] = profile
+        for amount_profile in amount_profiles.values():
+            amount_profile.finalize()
         return profiles, amount_profiles
 
 
+_matcher_cache: LruCache[str, VendorMatcher] = LruCache(maxsize=_MATCHER_CACHE_SIZE)
+
+
+def _history_digest(history: Sequence[SageHistoryEntry]) -> str:
+    """Fingerprint the history fields that feed `VendorMatcher` profiles."""
+    signals = [
+        (
+            entry.vendor_hint,
+            entry.description_clean,
+            entry.nominal_code,
+            entry.tax_code,
+            entry.amount,
+        )
+        for entry in history
+    ]
+    payload = pickle.dumps(signals, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _matcher_for(history: Sequence[SageHistoryEntry]) -> VendorMatcher:
+    """Return a matcher for `history`, reusing one built for identical input."""
+    digest = _history_digest(history)
+    matcher = _matcher_cache.get(digest)
+    if matcher is None:
+        matcher = VendorMatcher(history)
+        _matcher_cache.put(digest, matcher)
+    return matcher
+
+
 def suggest_for_transactions(
     transactions: Sequence[BankTxn], history: Sequence[SageHistoryEntry]
 ) -> list[Suggestion]:
     """Convenience helper for batch suggestion generation."""
-    matcher = VendorMatcher(history)
+    if not history:
+        return [VendorMatcher._no_history(txn) for txn in transactions]
+    matcher = _matcher_for(history)
     return matcher.suggest_many(transactions)
 
 
@@ -5,16 +5,21 @@ from __future__ import annotations
 import csv
 import io
 import re
+import sys
 import uuid
 from dataclasses import dataclass
 from datetime import date, datetime
+from functools import lru_cache
+from hashlib import sha1
 from pathlib import Path
-from typing import ClassVar, Sequence, Union
+from typing import ClassVar, Iterable, Sequence, Union
 
 from accountantiq_schemas import BankTxn, Direction, SageHistoryEntry
 
 CsvSource = Union[Path, str, io.TextIOBase]
 
+_ID_NAMESPACE = uuid.NAMESPACE_URL.bytes
+
 _DATE_FORMATS: Sequence[str] = (
     "%Y-%m-%d",
     "%d/%m/%Y",
@@ -22,26 +27,70 @@ _DATE_FORMATS: Sequence[str] = (
     "%d/%m/%y",
     "%Y%m%d",
 )
+# The formats that can possibly match, keyed on the separator a date uses.
+# Year-first and day-first dashed dates are told apart by where the first
+# dash falls, so well-formed input parses on the first strptime attempt.
+_SLASH_DATE_FORMATS = tuple(fmt for fmt in _DATE_FORMATS if "/" in fmt)
+_ISO_DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y")
+_DAY_FIRST_DATE_FORMATS = ("%d-%m-%Y", "%Y-%m-%d")
+_COMPACT_DATE_FORMATS = tuple(
+    fmt for fmt in _DATE_FORMATS if "/" not in fmt and "-" not in fmt
+)
 
-_NON_ALPHA_RE = re.compile(r"[^a-z\s]")
-_MULTI_SPACE_RE = re.compile(r"\s+")
-_DATE_TOKEN_RE = re.compile(r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b")
-_NUMERIC_TOKEN_RE = re.compile(r"\b\d+\b")
+# Date and numeric tokens are made of characters outside [a-z], so a single
+# pass blanking non-letter runs removes them as well.
+_NON_ALPHA_RE = re.compile(r"[^a-z\s]+")
+# ASCII input only needs case folding and blanking of anything outside
+# [a-z] and whitespace, which str.translate does in a single C pass.
+_ASCII_CLEAN_TABLE = {
+    code: (chr(code).lower() if chr(code).isalpha() or chr(code).isspace() else " ")
+    for code in range(128)
+}
 
 
+@lru_cache(maxsize=8192)
 def clean_description(raw: str) -> str:
-    """Normalise descriptions for matching by stripping noise."""
-    lowered = raw.lower()
-    without_dates = _DATE_TOKEN_RE.sub(" ", lowered)
-    without_numbers = _NUMERIC_TOKEN_RE.sub(" ", without_dates)
-    alpha_only = _NON_ALPHA_RE.sub(" ", without_numbers)
-    squashed = _MULTI_SPACE_RE.sub(" ", alpha_only)
-    return squashed.strip()
+    """Normalise descriptions for matching by stripping noise.
+
+    Recurring vendors repeat the same raw descriptions across bank and history
+    rows, so results are memoised.
+    """
+    if raw.isascii():
+        return " ".join(raw.translate(_ASCII_CLEAN_TABLE).split())
+    return " ".join(_NON_ALPHA_RE.sub(" ", raw.lower()).split())
 
 
+def _date_formats_for(candidate: str) -> Sequence[str]:
+    if "/" in candidate:
+        return _SLASH_DATE_FORMATS
+    dash = candidate.find("-")
+    if dash == 4:
+        return _ISO_DATE_FORMATS
+    if dash != -1:
+        return _DAY_FIRST_DATE_FORMATS
+    return _COMPACT_DATE_FORMATS
+
+
+@lru_cache(maxsize=4096)
 def _parse_date(value: str) -> date:
+    # Statements repeat the same handful of dates across many rows.
     candidate = value.strip()
-    for fmt in _DATE_FORMATS:
+    if len(candidate) == 10 and candidate[4] == "-" and candidate[7] == "-":
+        # Zero-padded ISO dates are the common case and parse without strptime;
+        # anything fromisoformat rejects still goes through the format list.
+        try:
+            return date.fromisoformat(candidate)
+        except ValueError:
+            pass
+    elif len(candidate) == 10 and candidate[2] == "/" and candidate[5] == "/":
+        # UK exports use dd/mm/yyyy; fixed-width digits can be sliced directly.
+        digits = candidate[:2] + candidate[3:5] + candidate[6:]
+        if digits.isascii() and digits.isdigit():
+            try:
+                return date(int(digits[4:]), int(digits[2:4]), int(digits[:2]))
+            except ValueError:
+                pass
+    for fmt in _date_formats_for(candidate):
         try:
             return datetime.strptime(candidate, fmt).date()
         except ValueError:
@@ -60,30 +109,74 @@ def _parse_amount(value: str) -> float:
 
 
 def _deterministic_id(*parts: str) -> str:
+    """Return ``str(uuid.uuid5(uuid.NAMESPACE_URL, key))`` for the joined parts.
+
+    IDs are persisted in review queues, so the value must stay uuid5; building
+    the string from the SHA-1 digest directly skips the `uuid.UUID` round trip.
+    """
     key = "|".join(part.strip() for part in parts)
-    return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+    digest = bytearray(sha1(_ID_NAMESPACE + key.encode()).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    hexed = digest.hex()
+    return f"{hexed[:8]}-{hexed[8:12]}-{hexed[12:16]}-{hexed[16:20]}-{hexed[20:]}"
+
+
+# Candidate header names resolved to column positions. Each name keeps every
+# position it appears at, last first, mirroring a dict built from the row.
+Columns = tuple[tuple[int, ...], ...]
 
 
-def _resolve_field(row: dict[str, str], candidates: Sequence[str]) -> str:
-    for candidate in candidates:
-        if candidate in row and row[candidate] not in (None, ""):
-            return row[candidate]
-    raise KeyError(f"Could not resolve any of {candidates} in row: {row}")
+def _header_positions(header: Sequence[str]) -> dict[str, tuple[int, ...]]:
+    positions: dict[str, list[int]] = {}
+    for index, cell in enumerate(header):
+        positions.setdefault(cell.lower(), []).insert(0, index)
+    return {name: tuple(indexes) for name, indexes in positions.items()}
+
+
+def _column_indexes(
+    positions: dict[str, tuple[int, ...]], candidates: Sequence[str]
+) -> Columns:
+    return tuple(positions[name] for name in candidates if name in positions)
+
+
+def _resolve_field(row: Sequence[str], columns: Columns) -> str:
+    """Return the first non-empty cell among the candidate columns."""
+    width = len(row)
+    for indexes in columns:
+        for index in indexes:
+            if index < width:
+                if row[index]:
+                    return row[index]
+                break
+    raise KeyError(f"Could not resolve any of columns {columns} in row: {row}")
+
+
+def _optional_field(row: Sequence[str], columns: Columns, default: str) -> str:
+    width = len(row)
+    for indexes in columns:
+        for index in indexes:
+            if index < width:
+                return row[index]
+    return default
 
 
 def _read_csv_rows(source: CsvSource) -> list[list[str]]:
     """Return a trimmed list of CSV rows from any supported source."""
     if isinstance(source, io.TextIOBase):
-        text = source.read()
-        if hasattr(source, "seek"):
+        rows = _collect_rows(source)
+        if source.seekable():
             source.seek(0)
-    else:
-        path = Path(source)
-        text = path.read_text(encoding="utf-8-sig")
-    buffer = io.StringIO(text)
-    reader = csv.reader(buffer)
+        return rows
+    # Stream the file rather than holding a decoded copy of it; newline
+    # handling matches `Path.read_text`.
+    with Path(source).open(encoding="utf-8-sig") as handle:
+        return _collect_rows(handle)
+
+
+def _collect_rows(lines: Iterable[str]) -> list[list[str]]:
     rows: list[list[str]] = []
-    for row in reader:
+    for row in csv.reader(lines):
         trimmed = [cell.strip() for cell in row]
         if any(trimmed):
             rows.append(trimmed)
@@ -127,19 +220,19 @@ class BankCsvParser:
         return self._parse_without_headers(rows)
 
     def _parse_with_headers(self, rows: list[list[str]]) -> list[BankTxn]:
-        fieldnames = [cell.lower() for cell in rows[0]]
-        data_rows = rows[1:]
+        positions = _header_positions(rows[0])
+        columns = (
+            _column_indexes(positions, self.date_headers),
+            _column_indexes(positions, self.amount_headers),
+            _column_indexes(positions, self.description_headers),
+            _column_indexes(positions, self.account_headers),
+        )
         results: list[BankTxn] = []
-        for idx, raw in enumerate(data_rows, start=1):
+        for idx, raw in enumerate(rows[1:], start=1):
             if not any(raw):
                 continue
-            normalised_row = {
-                fieldnames[col_index]: raw[col_index]
-                for col_index in range(min(len(fieldnames), len(raw)))
-                if fieldnames[col_index]
-            }
             try:
-                results.append(self._build_bank_txn(normalised_row, idx))
+                results.append(self._build_bank_txn(raw, columns, idx))
             except (KeyError, ValueError):
                 continue
         return results
@@ -185,7 +278,7 @@ class BankCsvParser:
                     direction=direction,
                     description_raw=description_raw,
                     description_clean=clean_description(description_raw),
-                    account_id=account_raw or "default",
+                    account_id=sys.intern(account_raw or "default"),
                 )
             )
         return results
@@ -227,15 +320,18 @@ class BankCsvParser:
             direction=direction,
             description_raw=description_raw or "statement line",
             description_clean=clean_description(description_raw or "statement line"),
-            account_id=account_raw,
+            account_id=sys.intern(account_raw),
         )
 
-    def _build_bank_txn(self, row: dict[str, str], idx: int) -> BankTxn:
-        date_raw = _resolve_field(row, self.date_headers)
-        amount_raw = _resolve_field(row, self.amount_headers)
-        description_raw = _resolve_field(row, self.description_headers)
+    def _build_bank_txn(
+        self, row: Sequence[str], columns: tuple[Columns, ...], idx: int
+    ) -> BankTxn:
+        date_cols, amount_cols, description_cols, account_cols = columns
+        date_raw = _resolve_field(row, date_cols)
+        amount_raw = _resolve_field(row, amount_cols)
+        description_raw = _resolve_field(row, description_cols)
         try:
-            account_raw = _resolve_field(row, self.account_headers)
+            account_raw = _resolve_field(row, account_cols)
         except KeyError:
             account_raw = "default"
         parsed_amount = _parse_amount(amount_raw)
@@ -249,7 +345,7 @@ class BankCsvParser:
             direction=direction,
             description_raw=description_raw,
             description_clean=clean,
-            account_id=account_raw or "default",
+            account_id=sys.intern(account_raw or "default"),
         )
 
 
@@ -280,19 +376,21 @@ class SageHistoryParser:
         return self._parse_without_headers(rows)
 
     def _parse_with_headers(self, rows: list[list[str]]) -> list[SageHistoryEntry]:
-        fieldnames = [cell.lower() for cell in rows[0]]
-        data_rows = rows[1:]
+        positions = _header_positions(rows[0])
+        columns = (
+            _column_indexes(positions, self.date_headers),
+            _column_indexes(positions, self.net_amount_headers),
+            _column_indexes(positions, self.details_headers),
+            _column_indexes(positions, self.nominal_headers),
+            _column_indexes(positions, self.tax_code_headers),
+            _column_indexes(positions, self.reference_headers[:1]),
+        )
         results: list[SageHistoryEntry] = []
-        for idx, raw in enumerate(data_rows, start=1):
+        for idx, raw in enumerate(rows[1:], start=1):
             if not any(raw):
                 continue
-            normalised_row = {
-                fieldnames[col_index]: raw[col_index]
-                for col_index in range(min(len(fieldnames), len(raw)))
-                if fieldnames[col_index]
-            }
             try:
-                results.append(self._build_history_entry(normalised_row, idx))
+                results.append(self._build_history_entry(raw, columns, idx))
             except (KeyError, ValueError):
                 continue
         return results
@@ -321,7 +419,8 @@ class SageHistoryParser:
             parsed_amount = _parse_amount(amount_raw) * _infer_audit_sign(
                 raw[1] if len(raw) > 1 else ""
             )
-            vendor_hint = self._derive_vendor_hint(clean_description(description_raw))
+            clean = clean_description(description_raw)
+            vendor_hint = self._derive_vendor_hint(clean)
             entry_id = _deterministic_id(
                 date_raw, nominal_raw, description_raw, str(idx)
             )
@@ -330,33 +429,45 @@ class SageHistoryParser:
                     id=entry_id,
                     date=_parse_date(date_raw),
                     amount=parsed_amount,
-                    nominal_code=nominal_raw,
-                    tax_code=tax_code_raw or "T0",
+                    nominal_code=sys.intern(nominal_raw),
+                    tax_code=sys.intern(tax_code_raw or "T0"),
                     description_raw=description_raw,
-                    description_clean=clean_description(description_raw),
+                    description_clean=clean,
                     vendor_hint=vendor_hint,
                 )
             )
         return results
 
-    def _build_history_entry(self, row: dict[str, str], idx: int) -> SageHistoryEntry:
-        date_raw = _resolve_field(row, self.date_headers)
-        amount_raw = _resolve_field(row, self.net_amount_headers)
-        description_raw = _resolve_field(row, self.details_headers)
-        nominal_raw = _resolve_field(row, self.nominal_headers)
-        tax_code_raw = _resolve_field(row, self.tax_code_headers)
-        reference_raw = row.get(self.reference_headers[0], str(idx))
+    def _build_history_entry(
+        self, row: Sequence[str], columns: tuple[Columns, ...], idx: int
+    ) -> SageHistoryEntry:
+        (
+            date_cols,
+            amount_cols,
+            details_cols,
+            nominal_cols,
+            tax_code_cols,
+            reference_cols,
+        ) = columns
+        date_raw = _resolve_field(row, date_cols)
+        amount_raw = _resolve_field(row, amount_cols)
+        description_raw = _resolve_field(row, details_cols)
+        nominal_raw = _resolve_field(row, nominal_cols)
+        tax_code_raw = _resolve_field(row, tax_code_cols)
+        reference_raw = _optional_field(row, reference_cols, str(idx))
         clean = clean_description(description_raw)
         vendor_hint = self._derive_vendor_hint(clean)
         entry_id = _deterministic_id(
             date_raw, amount_raw, description_raw, nominal_raw, reference_raw
         )
+        # Codes and hints repeat across thousands of rows; interning lets every
+        # entry share one string per distinct value.
         return SageHistoryEntry(
             id=entry_id,
             date=_parse_date(date_raw),
             amount=_parse_amount(amount_raw),
-            nominal_code=nominal_raw,
-            tax_code=tax_code_raw,
+            nominal_code=sys.intern(nominal_raw),
+            tax_code=sys.intern(tax_code_raw),
             description_raw=description_raw,
             description_clean=clean,
             vendor_hint=vendor_hint,
@@ -369,7 +480,7 @@ class SageHistoryParser:
         tokens = cleaned_description.split()
         if not tokens:
             return None
-        return " ".join(tokens[:3])
+        return sys.intern(" ".join(tokens[:3]))
 
 
 def _infer_audit_sign(tx_type: str) -> float:
@@ -7,6 +7,14 @@ from pathlib import Path
 import yaml
 from accountantiq_schemas import ProfileColumn, ProfileDefinition
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+from .cache import FileKey, LruCache, file_key
 from .workspace import profiles_path
 
 _DEFAULT_PROFILE = ProfileDefinition(
@@ -22,31 +30,55 @@ _DEFAULT_PROFILE = ProfileDefinition(
 )
 
 
+_PROFILE_CACHE_SIZE = 64
+
+_profile_cache: LruCache[FileKey, ProfileDefinition] = LruCache(
+    maxsize=_PROFILE_CACHE_SIZE
+)
+
+
+def _read_profile(path: Path, key: FileKey) -> ProfileDefinition:
+    """Parse a profile file, reusing the result until the file changes."""
+    profile = _profile_cache.get(key)
+    if profile is None:
+        raw = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader)
+        profile = ProfileDefinition.model_validate(raw)
+        _profile_cache.put(key, profile)
+    return profile
+
+
 def profile_path(client_slug: str, name: str) -> Path:
     return profiles_path(client_slug) / f"{name}.yaml"
 
 
 def load_profile(client_slug: str, name: str = "default") -> ProfileDefinition:
     path = profile_path(client_slug, name)
-    if not path.exists():
+    key = file_key(path)
+    if key is None:
         save_profile(client_slug, _DEFAULT_PROFILE)
         return _DEFAULT_PROFILE
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return ProfileDefinition.model_validate(raw)
+    return _read_profile(path, key)
 
 
 def save_profile(client_slug: str, profile: ProfileDefinition) -> None:
     path = profile_path(client_slug, profile.name)
     payload = profile.model_dump()
-    path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
+    path.write_text(
+        yaml.dump(payload, Dumper=_YamlDumper, sort_keys=False), encoding="utf-8"
+    )
+    # A same-size rewrite within one mtime tick keeps the old key.
+    key = file_key(path)
+    if key is not None:
+        _profile_cache.put(key, profile)
 
 
 def list_profiles(client_slug: str) -> list[ProfileDefinition]:
     directory = profiles_path(client_slug)
     profiles: list[ProfileDefinition] = []
     for file in directory.glob("*.yaml"):
-        raw = yaml.safe_load(file.read_text(encoding="utf-8"))
-        profiles.append(ProfileDefinition.model_validate(raw))
+        key = file_key(file)
+        if key is not None:
+            profiles.append(_read_profile(file, key))
     if not profiles:
         profiles.append(load_profile(client_slug))
     return profiles
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 from datetime import datetime, timezone
-from typing import Any, Iterable, Sequence, cast
+from typing import Any, Iterable, Sequence
 
 from accountantiq_schemas import (
     ApprovalRequest,
@@ -16,8 +17,11 @@ from accountantiq_schemas import (
     Suggestion,
 )
 
+from .cache import LruCache
 from .workspace import review_db_path
 
+_STORE_CACHE_SIZE = 32
+
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS review_items (
     txn_id TEXT PRIMARY KEY,
@@ -30,6 +34,51 @@ CREATE TABLE IF NOT EXISTS review_items (
     created_at TEXT NOT NULL,
     updated_at TEXT NOT NULL
 );
+CREATE INDEX IF NOT EXISTS idx_review_status_created
+    ON review_items (status, created_at);
+"""
+
+# WAL persists in the database file; the other settings are per connection.
+_JOURNAL_PRAGMA = "PRAGMA journal_mode=WAL"
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_INSERT_SQL = """
+INSERT OR REPLACE INTO review_items (
+    txn_id,
+    txn_json,
+    suggestion_json,
+    status,
+    nominal_final,
+    tax_code_final,
+    notes_json,
+    created_at,
+    updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Columns read back into a ReviewItem, in the order `_row_to_item` unpacks.
+_ITEM_COLUMNS = (
+    "txn_json, suggestion_json, status, nominal_final, tax_code_final, "
+    "notes_json, created_at, updated_at"
+)
+
+# Approval keeps any final codes already set and otherwise adopts the stored
+# suggestion; notes are only rewritten when a note is being appended.
+_APPROVE_SQL = """
+UPDATE review_items
+SET status = ?,
+    nominal_final = COALESCE(
+        nominal_final, json_extract(suggestion_json, '$.nominal_suggested')
+    ),
+    tax_code_final = COALESCE(
+        tax_code_final, json_extract(suggestion_json, '$.tax_code_suggested')
+    ),
+    notes_json = COALESCE(?, notes_json),
+    updated_at = ?
+WHERE txn_id = ?
 """
 
 
@@ -44,16 +93,55 @@ class ReviewStore:
         self.client_slug = client_slug
         self.db_path = review_db_path(client_slug)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._ensure_schema()
+        # One connection per store, shared by request threads and serialised
+        # by the lock; the connection context still commits or rolls back.
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        with self._lock:
+            self._connection()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    @classmethod
+    def for_client(cls, client_slug: str) -> ReviewStore:
+        """Return the shared store for `client_slug`.
 
-    def _ensure_schema(self) -> None:
-        with self._connect() as conn:
-            conn.executescript(_SCHEMA)
+        Stores hold their database open, so workspaces are removed through
+        `workspace.remove_client`, which invalidates the store first.
+        """
+        store = _stores.get(client_slug)
+        if store is None:
+            store = cls(client_slug)
+            _stores.put(client_slug, store)
+        return store
+
+    @staticmethod
+    def invalidate(client_slug: str | None = None) -> None:
+        """Close and forget the shared store for `client_slug`, or every store."""
+        if client_slug is None:
+            _stores.clear()
+        else:
+            _stores.discard(client_slug)
+
+    def close(self) -> None:
+        """Close the database connection; the next call on the store reopens it.
+
+        SQLite files cannot be deleted on Windows while a connection holds them.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Callers hold `self._lock`.
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            with conn:
+                conn.execute(_JOURNAL_PRAGMA)
+                conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
 
     def import_batch(
         self,
@@ -65,98 +153,89 @@ class ReviewStore:
             msg = "Transactions and suggestions must be the same length"
             raise ValueError(msg)
         now = _utc_now().isoformat()
-        with self._connect() as conn:
+        empty_notes = json.dumps([])
+        with self._lock, self._connection() as conn:
             if reset:
                 conn.execute("DELETE FROM review_items")
-            for txn, suggestion in zip(txns, suggestions, strict=True):
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO review_items (
-                        txn_id,
-                        txn_json,
-                        suggestion_json,
-                        status,
-                        nominal_final,
-                        tax_code_final,
-                        notes_json,
-                        created_at,
-                        updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+            conn.executemany(
+                _INSERT_SQL,
+                (
                     (
                         txn.id,
-                        json.dumps(txn.model_dump(mode="json")),
-                        json.dumps(suggestion.model_dump(mode="json")),
+                        txn.model_dump_json(),
+                        suggestion.model_dump_json(),
                         ReviewStatus.PENDING.value,
                         suggestion.nominal_suggested,
                         suggestion.tax_code_suggested,
-                        json.dumps([]),
+                        empty_notes,
                         now,
                         now,
-                    ),
-                )
+                    )
+                    for txn, suggestion in zip(txns, suggestions, strict=True)
+                ),
+            )
         return self.list_items()
 
     def list_items(self) -> list[ReviewItem]:
-        with self._connect() as conn:
+        with self._lock, self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM review_items "
+                "ORDER BY created_at ASC, rowid ASC"
+            ).fetchall()
+        return [self._row_to_item(row) for row in rows]
+
+    def list_by_status(self, *statuses: ReviewStatus) -> list[ReviewItem]:
+        """Return items in any of `statuses`, in `list_items` order."""
+        if not statuses:
+            return []
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock, self._connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM review_items ORDER BY created_at ASC"
+                f"SELECT {_ITEM_COLUMNS} FROM review_items "
+                f"WHERE status IN ({placeholders}) "
+                "ORDER BY created_at ASC, rowid ASC",
+                [status.value for status in statuses],
             ).fetchall()
         return [self._row_to_item(row) for row in rows]
 
     def approve(
         self, txn_id: str, payload: ApprovalRequest | None = None
     ) -> ReviewItem:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM review_items WHERE txn_id = ?",
-                (txn_id,),
-            ).fetchone()
-            if row is None:
-                raise KeyError(f"Transaction {txn_id} not found in review queue")
-            notes = json.loads(row["notes_json"])
-            if payload and payload.note:
-                notes.append(payload.note)
-            conn.execute(
-                """
-                UPDATE review_items
-                SET status = ?,
-                    nominal_final = CASE
-                        WHEN nominal_final IS NULL THEN ?
-                        ELSE nominal_final
-                    END,
-                    tax_code_final = CASE
-                        WHEN tax_code_final IS NULL THEN ?
-                        ELSE tax_code_final
-                    END,
-                    notes_json = ?,
-                    updated_at = ?
-                WHERE txn_id = ?
-                """,
+        note = payload.note if payload else None
+        with self._lock, self._connection() as conn:
+            notes_json: str | None = None
+            if note:
+                row = conn.execute(
+                    "SELECT notes_json FROM review_items WHERE txn_id = ?",
+                    (txn_id,),
+                ).fetchone()
+                if row is None:
+                    raise KeyError(f"Transaction {txn_id} not found in review queue")
+                notes = json.loads(row[0])
+                notes.append(note)
+                notes_json = json.dumps(notes)
+            cursor = conn.execute(
+                _APPROVE_SQL,
                 (
                     ReviewStatus.APPROVED.value,
-                    self._suggestion_value(
-                        row, "nominal_final", "suggestion_json", "nominal_suggested"
-                    ),
-                    self._suggestion_value(
-                        row, "tax_code_final", "suggestion_json", "tax_code_suggested"
-                    ),
-                    json.dumps(notes),
+                    notes_json,
                     _utc_now().isoformat(),
                     txn_id,
                 ),
             )
+            if cursor.rowcount == 0:
+                raise KeyError(f"Transaction {txn_id} not found in review queue")
         return self.get_item(txn_id)
 
     def override(self, txn_id: str, payload: OverrideRequest) -> ReviewItem:
-        with self._connect() as conn:
+        with self._lock, self._connection() as conn:
             row = conn.execute(
-                "SELECT * FROM review_items WHERE txn_id = ?",
+                "SELECT notes_json FROM review_items WHERE txn_id = ?",
                 (txn_id,),
             ).fetchone()
             if row is None:
                 raise KeyError(f"Transaction {txn_id} not found in review queue")
-            notes = json.loads(row["notes_json"])
+            notes = json.loads(row[0])
             if payload.note:
                 notes.append(payload.note)
             conn.execute(
@@ -181,9 +260,9 @@ class ReviewStore:
         return self.get_item(txn_id)
 
     def get_item(self, txn_id: str) -> ReviewItem:
-        with self._connect() as conn:
+        with self._lock, self._connection() as conn:
             row = conn.execute(
-                "SELECT * FROM review_items WHERE txn_id = ?",
+                f"SELECT {_ITEM_COLUMNS} FROM review_items WHERE txn_id = ?",
                 (txn_id,),
             ).fetchone()
         if row is None:
@@ -191,37 +270,34 @@ class ReviewStore:
         return self._row_to_item(row)
 
     @staticmethod
-    def _suggestion_value(
-        row: sqlite3.Row,
-        column: str,
-        suggestion_column: str,
-        suggestion_key: str,
-    ) -> str | None:
-        current = row[column]
-        if current is not None:
-            return cast(str, current)
-        suggestion_payload = json.loads(row[suggestion_column])
-        value: Any = suggestion_payload.get(suggestion_key)
-        return cast(str | None, value)
-
-    @staticmethod
-    def _row_to_item(row: sqlite3.Row) -> ReviewItem:
-        txn = BankTxn.model_validate_json(row["txn_json"])
-        suggestion = Suggestion.model_validate_json(row["suggestion_json"])
-        status = ReviewStatus(row["status"])
-        notes = json.loads(row["notes_json"]) or []
+    def _row_to_item(row: Sequence[Any]) -> ReviewItem:
+        (
+            txn_json,
+            suggestion_json,
+            status,
+            nominal_final,
+            tax_code_final,
+            notes_json,
+            created_at,
+            updated_at,
+        ) = row
         return ReviewItem(
-            txn=txn,
-            suggestion=suggestion,
-            status=status,
-            nominal_final=row["nominal_final"],
-            tax_code_final=row["tax_code_final"],
-            notes=notes,
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
+            txn=BankTxn.model_validate_json(txn_json),
+            suggestion=Suggestion.model_validate_json(suggestion_json),
+            status=ReviewStatus(status),
+            nominal_final=nominal_final,
+            tax_code_final=tax_code_final,
+            notes=json.loads(notes_json) or [],
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at),
         )
 
 
+_stores: LruCache[str, ReviewStore] = LruCache(
+    maxsize=_STORE_CACHE_SIZE, on_evict=ReviewStore.close
+)
+
+
 def pending_items(items: Iterable[ReviewItem]) -> list[ReviewItem]:
     return [item for item in items if item.status == ReviewStatus.PENDING]
 
@@ -3,29 +3,86 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass
 from typing import Iterable
 
 import yaml
 from accountantiq_schemas import BankTxn, RuleDefinition
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+from .cache import FileKey, LruCache, file_key
 from .parsers import clean_description
 from .workspace import rules_path
 
+_COMPILED_CACHE_SIZE = 32
+_RULES_CACHE_SIZE = 32
 
-def load_rules(client_slug: str) -> list[RuleDefinition]:
+
+@dataclass(frozen=True, slots=True)
+class CompiledRules:
+    """Rules with their patterns compiled once, evaluated in file order."""
+
+    rules: tuple[RuleDefinition, ...]
+    patterns: tuple[re.Pattern[str], ...]
+    any_pattern: re.Pattern[str] | None = None
+
+    def match(self, txn: BankTxn) -> RuleDefinition | None:
+        description = txn.description_clean or txn.description_raw.lower()
+        # One scan rejects descriptions no rule can match; the union's leftmost
+        # hit need not be the first rule in order, so hits still go in order.
+        if self.any_pattern is not None and not self.any_pattern.search(description):
+            return None
+        for rule, pattern in zip(self.rules, self.patterns, strict=True):
+            if pattern.search(description):
+                return rule
+        return None
+
+
+_compiled_cache: LruCache[FileKey, CompiledRules] = LruCache(
+    maxsize=_COMPILED_CACHE_SIZE
+)
+_rules_cache: LruCache[FileKey, tuple[RuleDefinition, ...]] = LruCache(
+    maxsize=_RULES_CACHE_SIZE
+)
+
+
+def _read_rules(client_slug: str) -> tuple[RuleDefinition, ...]:
+    """Parse a client's rules file, reusing the result until the file changes."""
     path = rules_path(client_slug)
-    if not path.exists():
-        return []
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
-    if not raw:
-        return []
-    return [RuleDefinition.model_validate(item) for item in raw]
+    key = file_key(path)
+    if key is None:
+        return ()
+    rules = _rules_cache.get(key)
+    if rules is None:
+        raw = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader)
+        rules = tuple(RuleDefinition.model_validate(item) for item in raw or ())
+        _rules_cache.put(key, rules)
+    return rules
+
+
+def load_rules(client_slug: str) -> list[RuleDefinition]:
+    return list(_read_rules(client_slug))
 
 
 def save_rules(client_slug: str, rules: Iterable[RuleDefinition]) -> None:
     path = rules_path(client_slug)
-    serialisable = [rule.model_dump() for rule in rules]
-    path.write_text(yaml.safe_dump(serialisable, sort_keys=False), encoding="utf-8")
+    saved = tuple(rules)
+    serialisable = [rule.model_dump() for rule in saved]
+    path.write_text(
+        yaml.dump(serialisable, Dumper=_YamlDumper, sort_keys=False), encoding="utf-8"
+    )
+    # A same-size rewrite within one mtime tick keeps the old key, so the
+    # caches are refreshed under the new key rather than left to expire.
+    key = file_key(path)
+    if key is not None:
+        _rules_cache.put(key, saved)
+        _compiled_cache.put(key, compile_rules(saved))
 
 
 def _rule_exists(existing: Iterable[RuleDefinition], candidate: RuleDefinition) -> bool:
@@ -53,6 +110,45 @@ def append_rule(client_slug: str, rule: RuleDefinition) -> list[RuleDefinition]:
     return load_rules(client_slug)
 
 
+def _union_pattern(
+    rules: tuple[RuleDefinition, ...], patterns: tuple[re.Pattern[str], ...]
+) -> re.Pattern[str] | None:
+    """Join group-free patterns into one alternation, or None if unsafe."""
+    if len(patterns) < 2 or any(pattern.groups for pattern in patterns):
+        return None
+    # Generated rules carry a leading (?i); it is redundant under IGNORECASE
+    # and not allowed mid-expression.
+    sources = [rule.pattern.removeprefix("(?i)") for rule in rules]
+    try:
+        return re.compile(
+            "|".join(f"(?:{source})" for source in sources), re.IGNORECASE
+        )
+    except re.error:
+        return None
+
+
+def compile_rules(rules: Iterable[RuleDefinition]) -> CompiledRules:
+    ordered = tuple(rules)
+    patterns = tuple(re.compile(rule.pattern, re.IGNORECASE) for rule in ordered)
+    return CompiledRules(
+        rules=ordered,
+        patterns=patterns,
+        any_pattern=_union_pattern(ordered, patterns),
+    )
+
+
+def load_compiled_rules(client_slug: str) -> CompiledRules:
+    """Load and compile a client's rules, reusing them until the file changes."""
+    key = file_key(rules_path(client_slug))
+    if key is None:
+        return compile_rules([])
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        compiled = compile_rules(_read_rules(client_slug))
+        _compiled_cache.put(key, compiled)
+    return compiled
+
+
 def match_rule(rules: Iterable[RuleDefinition], txn: BankTxn) -> RuleDefinition | None:
     description = txn.description_clean or txn.description_raw.lower()
     for rule in rules:
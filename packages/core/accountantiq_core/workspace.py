@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
 
 DATA_ROOT = Path("data/clients")
@@ -13,6 +14,17 @@ def client_root(client_slug: str) -> Path:
     return root
 
 
+def remove_client(client_slug: str) -> None:
+    """Delete a client's workspace, closing its shared review store first."""
+    # Deferred: the review store itself depends on this module.
+    from .review import ReviewStore
+
+    ReviewStore.invalidate(client_slug)
+    root = DATA_ROOT / client_slug
+    if root.exists():
+        shutil.rmtree(root)
+
+
 def inputs_path(client_slug: str) -> Path:
     path = client_root(client_slug) / "inputs"
     path.mkdir(parents=True, exist_ok=True)
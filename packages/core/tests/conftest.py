@@ -0,0 +1,13 @@
+"""Shared fixtures for the core package tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from accountantiq_core import workspace as workspace_module
+
+
+@pytest.fixture(autouse=True)
+def _isolated_workspace(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(workspace_module, "DATA_ROOT", tmp_path)
@@ -0,0 +1,65 @@
+"""Tests for the audit trail exporter."""
+
+from __future__ import annotations
+
+import csv
+from datetime import date, datetime
+
+from accountantiq_core.exporter import build_row, export_review
+from accountantiq_schemas import (
+    BankTxn,
+    ProfileColumn,
+    ProfileDefinition,
+    ReviewItem,
+    Suggestion,
+)
+
+
+def _item(nominal_final: str | None = None) -> ReviewItem:
+    now = datetime(2025, 1, 2, 9, 30)
+    return ReviewItem(
+        txn=BankTxn(
+            id="txn-1",
+            date=date(2025, 1, 2),
+            amount=-12.345,
+            direction="debit",
+            description_raw="DENPLAN LTD",
+            description_clean="denplan ltd",
+            account_id="TEST",
+        ),
+        suggestion=Suggestion(
+            txn_id="txn-1",
+            nominal_suggested="4000",
+            confidence=0.555,
+        ),
+        nominal_final=nominal_final,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _profile(*fields: str) -> ProfileDefinition:
+    return ProfileDefinition(
+        columns=[ProfileColumn(field=name, header=name.upper()) for name in fields]
+    )
+
+
+def test_build_row_follows_profile_order_and_blanks_unknown_fields() -> None:
+    profile = _profile("net_amount", "unknown", "date", "nominal_code", "confidence")
+
+    assert build_row(_item(), profile) == ["-12.35", "", "2025-01-02", "4000", "56"]
+    assert build_row(_item(nominal_final="7000"), profile)[3] == "7000"
+
+
+def test_export_review_writes_header_and_rows() -> None:
+    profile = _profile("transaction_id", "tax_code", "status")
+
+    destination = export_review("demo", [_item(), _item()], profile)
+
+    with open(destination, newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))
+    assert rows == [
+        ["TRANSACTION_ID", "TAX_CODE", "STATUS"],
+        ["txn-1", "", "pending"],
+        ["txn-1", "", "pending"],
+    ]
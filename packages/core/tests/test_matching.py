@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
 from accountantiq_core import (
     BankCsvParser,
     SageHistoryParser,
     VendorMatcher,
     suggest_for_transactions,
 )
+from accountantiq_core.matching import _matcher_for
 from accountantiq_schemas import BankTxn, Direction, SageHistoryEntry
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -20,23 +23,34 @@ _bank_parser = BankCsvParser()
 _history_parser = SageHistoryParser()
 
 
-def load_bank() -> list[BankTxn]:
+# The examples never change during a run, so each is parsed once; tuples keep
+# the shared results from being mutated by individual tests.
+@lru_cache(maxsize=None)
+def load_bank() -> tuple[BankTxn, ...]:
     bank_files = ["bank_sample_01.csv", "bank_sample_02.csv"]
     txns: list[BankTxn] = []
     for filename in bank_files:
         txns.extend(_bank_parser.parse(EXAMPLES_DIR / filename))
-    return txns
+    return tuple(txns)
 
 
-def load_history() -> list[SageHistoryEntry]:
-    return _history_parser.parse(EXAMPLES_DIR / "sage_history_sample.csv")
+@lru_cache(maxsize=None)
+def load_history() -> tuple[SageHistoryEntry, ...]:
+    return tuple(_history_parser.parse(EXAMPLES_DIR / "sage_history_sample.csv"))
 
 
-def test_vendor_matcher_returns_high_confidence_for_known_vendor() -> None:
-    match = VendorMatcher(load_history())
+# Matchers are read-only once built, so the tests can share one.
+@pytest.fixture(scope="module")
+def matcher() -> VendorMatcher:
+    return VendorMatcher(load_history())
+
+
+def test_vendor_matcher_returns_high_confidence_for_known_vendor(
+    matcher: VendorMatcher,
+) -> None:
     bank_txn = load_bank()[0]
 
-    suggestion = match.suggest(bank_txn)
+    suggestion = matcher.suggest(bank_txn)
 
     assert suggestion.nominal_suggested == "5100"
     assert suggestion.tax_code_suggested == "T1"
@@ -44,8 +58,9 @@ def test_vendor_matcher_returns_high_confidence_for_known_vendor() -> None:
     assert any("vendor" in note.lower() for note in suggestion.explanations)
 
 
-def test_vendor_matcher_handles_unknown_vendor_gracefully() -> None:
-    match = VendorMatcher(load_history())
+def test_vendor_matcher_handles_unknown_vendor_gracefully(
+    matcher: VendorMatcher,
+) -> None:
     sample = load_bank()[0]
     unknown_txn = BankTxn(
         id="unknown-txn",
@@ -57,7 +72,7 @@ def test_vendor_matcher_handles_unknown_vendor_gracefully() -> None:
         account_id=sample.account_id,
     )
 
-    suggestion = match.suggest(unknown_txn)
+    suggestion = matcher.suggest(unknown_txn)
 
     assert suggestion.nominal_suggested is None
     assert suggestion.confidence == 0.0
@@ -65,10 +80,10 @@ def test_vendor_matcher_handles_unknown_vendor_gracefully() -> None:
     assert "no high-confidence" in suggestion.explanations[0].lower()
 
 
-def test_vendor_matcher_uses_amount_fallback_for_new_description() -> None:
-    history = load_history()
-    match = VendorMatcher(history)
-    reference = history[0]
+def test_vendor_matcher_uses_amount_fallback_for_new_description(
+    matcher: VendorMatcher,
+) -> None:
+    reference = load_history()[0]
     direction: Direction = "debit" if reference.amount < 0 else "credit"
     txn = BankTxn(
         id="amount-fallback",
@@ -80,7 +95,7 @@ def test_vendor_matcher_uses_amount_fallback_for_new_description() -> None:
         account_id="TEST",
     )
 
-    suggestion = match.suggest(txn)
+    suggestion = matcher.suggest(txn)
 
     assert suggestion.nominal_suggested == reference.nominal_code
     assert suggestion.tax_code_suggested == reference.tax_code
@@ -96,3 +111,47 @@ def test_suggest_for_transactions_matches_batch_output() -> None:
 
     assert len(suggestions) == len(bank_txns)
     assert suggestions[0].txn_id == bank_txns[0].id
+
+
+def test_matcher_is_reused_for_identical_history() -> None:
+    history = load_history()
+
+    first = _matcher_for(history)
+    second = _matcher_for(list(load_history()))
+    different = _matcher_for(history[:1])
+
+    assert first is second
+    assert different is not first
+
+
+def test_suggest_many_matches_single_suggestions(matcher: VendorMatcher) -> None:
+    bank_txns = load_bank()
+    repeated = [*bank_txns, *bank_txns]
+
+    batch = matcher.suggest_many(repeated)
+
+    assert batch == [matcher.suggest(txn) for txn in repeated]
+
+
+def test_vendor_matcher_fuzzy_matches_without_shared_tokens(
+    matcher: VendorMatcher,
+) -> None:
+    sample = load_bank()[0]
+    typo_txn = sample.model_copy(
+        update={"id": "typo-txn", "description_clean": "denplann collectin"}
+    )
+
+    suggestion = matcher.suggest(typo_txn)
+
+    assert suggestion.nominal_suggested == "4000"
+    assert any("fuzzy vendor match" in note.lower() for note in suggestion.explanations)
+
+
+def test_suggest_for_transactions_without_history() -> None:
+    bank_txns = load_bank()[:2]
+
+    suggestions = suggest_for_transactions(bank_txns, [])
+
+    assert [s.txn_id for s in suggestions] == [txn.id for txn in bank_txns]
+    assert all(s.confidence == 0.0 for s in suggestions)
+    assert suggestions[0].explanations == ["No vendor history available"]
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import csv
 import io
+import uuid
+from datetime import date
 from pathlib import Path
 
+import pytest
 from accountantiq_core import BankCsvParser, SageHistoryParser, clean_description
+from accountantiq_core.parsers import _deterministic_id, _parse_date
 
 REPO_ROOT = Path(__file__).resolve().parents[3]
 EXAMPLES_DIR = REPO_ROOT / "examples"
@@ -45,6 +49,11 @@ def test_clean_description_removes_dates_and_numbers() -> None:
     assert clean_description(raw) == "acme supplies inv"
 
 
+def test_clean_description_handles_punctuation_and_non_ascii() -> None:
+    assert clean_description("FPS,\tGbp Faster-Payment 9") == "fps gbp faster payment"
+    assert clean_description("CAFÉ NERO 12/03/2024") == "caf nero"
+
+
 def test_bank_parser_handles_headerless_sage_export() -> None:
     rows = [
         [
@@ -203,3 +212,70 @@ def test_sage_history_parser_handles_audit_trail_export_without_headers() -> Non
     assert apple.amount == 59.0
     assert amazon.nominal_code == "5000"
     assert apple.nominal_code == "1105"
+
+
+def test_deterministic_ids_match_uuid5() -> None:
+    parts = (" 2024-01-05", "-12.50", "ACME SUPPLIES Ltd", "3")
+    expected = uuid.uuid5(uuid.NAMESPACE_URL, "2024-01-05|-12.50|ACME SUPPLIES Ltd|3")
+    assert _deterministic_id(*parts) == str(expected)
+
+
+def test_bank_parser_empty_header_cell_falls_through_to_next_candidate() -> None:
+    rows = [
+        ["Date", "Amount", "Description", "Details"],
+        ["2025-01-02", "-5.00", "", "COFFEE SHOP"],
+    ]
+
+    txn = BankCsvParser().parse(_build_csv(rows))[0]
+
+    assert txn.description_raw == "COFFEE SHOP"
+    assert txn.account_id == "default"
+
+
+def test_bank_parser_duplicate_headers_use_last_copy_present_in_row() -> None:
+    rows = [
+        ["Date", "Amount", "Description", "Description"],
+        ["2025-01-02", "-5.00", "FIRST", "SECOND"],
+        ["2025-01-03", "-6.00", "FIRST"],
+    ]
+
+    full, short = BankCsvParser().parse(_build_csv(rows))
+
+    assert full.description_raw == "SECOND"
+    assert short.description_raw == "FIRST"
+
+
+def test_sage_history_parser_reference_defaults_only_when_column_missing() -> None:
+    header = ["Date", "Details", "Nominal Code", "Tax Code", "Net Amount"]
+    row = ["2025-01-02", "ACME", "5000", "T1", "-5.00"]
+    without_column = _build_csv([header, row])
+    with_empty_column = _build_csv([[*header, "Reference"], [*row, ""]])
+
+    missing = SageHistoryParser().parse(without_column)[0]
+    empty = SageHistoryParser().parse(with_empty_column)[0]
+
+    key = "2025-01-02|-5.00|ACME|5000|"
+    assert missing.id == str(uuid.uuid5(uuid.NAMESPACE_URL, key + "1"))
+    assert empty.id == str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["2023-01-05", "05-01-2023", "2023-1-5", "20230105", "05/01/23", "5/1/2023"],
+)
+def test_parse_date_accepts_supported_formats(value: str) -> None:
+    assert _parse_date(value) == date(2023, 1, 5)
+
+
+@pytest.mark.parametrize("value", ["31/02/2024", "2024-02-30"])
+def test_parse_date_rejects_invalid_calendar_dates(value: str) -> None:
+    with pytest.raises(ValueError):
+        _parse_date(value)
+
+
+def test_parse_date_slice_fast_path_falls_through_on_invalid_day() -> None:
+    # date() rejects the sliced fields; the format list and final fallback
+    # must still run, so the error comes from the fallback, not date().
+    with pytest.raises(ValueError, match="Unsupported date format: 31/02/2024"):
+        _parse_date("31/02/2024")
+    assert _parse_date("29/02/2024") == date(2024, 2, 29)
@@ -0,0 +1,40 @@
+"""Tests for audit profile storage and caching."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from accountantiq_core import list_profiles, load_profile, save_profile
+from accountantiq_core import profile as profile_module
+from accountantiq_core.cache import FileKey
+from accountantiq_schemas import ProfileColumn, ProfileDefinition
+
+
+def _profile(header: str) -> ProfileDefinition:
+    return ProfileDefinition(
+        name="custom", columns=[ProfileColumn(field="date", header=header)]
+    )
+
+
+def test_load_profile_creates_default_profile() -> None:
+    profile = load_profile("profile_client")
+
+    assert profile.name == "default"
+    assert [p.name for p in list_profiles("profile_client")] == ["default"]
+
+
+def test_save_profile_refreshes_cache_when_file_key_is_unchanged(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Simulate a coarse-mtime filesystem where a same-size rewrite keeps its key.
+    def coarse_key(path: Path) -> FileKey | None:
+        return (str(path), 0, path.stat().st_size) if path.exists() else None
+
+    monkeypatch.setattr(profile_module, "file_key", coarse_key)
+    save_profile("coarse_client", _profile("AAAA"))
+    assert load_profile("coarse_client", "custom").columns[0].header == "AAAA"
+
+    save_profile("coarse_client", _profile("BBBB"))
+
+    assert load_profile("coarse_client", "custom").columns[0].header == "BBBB"
@@ -0,0 +1,134 @@
+"""Tests for the SQLite-backed review queue."""
+
+from __future__ import annotations
+
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pytest
+from accountantiq_core import ReviewStore, remove_client
+from accountantiq_schemas import (
+    ApprovalRequest,
+    BankTxn,
+    OverrideRequest,
+    ReviewStatus,
+    Suggestion,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stores(_isolated_workspace: None) -> None:
+    ReviewStore.invalidate()
+
+
+def _batch() -> tuple[list[BankTxn], list[Suggestion]]:
+    txns = [
+        BankTxn(
+            id=f"txn-{idx}",
+            date=date(2025, 1, idx),
+            amount=-10.0 * idx,
+            direction="debit",
+            description_raw=f"VENDOR {idx}",
+            description_clean="vendor",
+            account_id="TEST",
+        )
+        for idx in range(1, 4)
+    ]
+    suggestions = [
+        Suggestion(
+            txn_id=txn.id,
+            nominal_suggested="5000",
+            tax_code_suggested="T1",
+            confidence=0.9,
+        )
+        for txn in txns
+    ]
+    return txns, suggestions
+
+
+def test_for_client_reuses_store_until_invalidated(tmp_path: Path) -> None:
+    store = ReviewStore.for_client("cached_client")
+    assert ReviewStore.for_client("cached_client") is store
+
+    ReviewStore.invalidate()
+    shutil.rmtree(tmp_path / "cached_client")
+
+    reopened = ReviewStore.for_client("cached_client")
+    assert reopened is not store
+    assert reopened.list_items() == []
+
+
+def test_remove_client_closes_store_and_deletes_workspace(tmp_path: Path) -> None:
+    store = ReviewStore.for_client("removed_client")
+    txns, suggestions = _batch()
+    store.import_batch(txns, suggestions)
+
+    remove_client("removed_client")
+
+    assert not (tmp_path / "removed_client").exists()
+    reopened = ReviewStore.for_client("removed_client")
+    assert reopened is not store
+    assert reopened.list_items() == []
+
+
+def test_review_store_approve_and_override() -> None:
+    store = ReviewStore.for_client("review_client")
+    txns, suggestions = _batch()
+
+    items = store.import_batch(txns, suggestions)
+    assert [item.status for item in items] == [ReviewStatus.PENDING] * 3
+
+    approved = store.approve("txn-1", ApprovalRequest(note="ok"))
+    assert approved.status == ReviewStatus.APPROVED
+    assert approved.nominal_final == "5000"
+    assert approved.notes == ["ok"]
+
+    overridden = store.override(
+        "txn-2", OverrideRequest(nominal_code="7400", tax_code="T0")
+    )
+    assert overridden.status == ReviewStatus.OVERRIDDEN
+    assert overridden.nominal_final == "7400"
+
+    plain = store.approve("txn-3")
+    assert plain.nominal_final == "5000"
+    assert plain.tax_code_final == "T1"
+    assert plain.notes == []
+
+    with pytest.raises(KeyError):
+        store.approve("missing")
+    with pytest.raises(KeyError):
+        store.approve("missing", ApprovalRequest(note="ok"))
+
+
+def test_list_by_status_filters_in_queue_order() -> None:
+    store = ReviewStore.for_client("status_client")
+    txns, suggestions = _batch()
+    store.import_batch(txns, suggestions)
+    store.approve("txn-3")
+    store.override("txn-1", OverrideRequest(nominal_code="7400", tax_code="T0"))
+
+    reviewed = store.list_by_status(ReviewStatus.APPROVED, ReviewStatus.OVERRIDDEN)
+    pending = store.list_by_status(ReviewStatus.PENDING)
+
+    assert [item.txn.id for item in reviewed] == ["txn-1", "txn-3"]
+    assert [item.txn.id for item in pending] == ["txn-2"]
+    assert store.list_by_status() == []
+
+
+def test_invalidate_closes_stores_and_closed_stores_reopen() -> None:
+    store = ReviewStore.for_client("closing_client")
+    txns, suggestions = _batch()
+    store.import_batch(txns, suggestions)
+
+    ReviewStore.invalidate()
+
+    # Closing the last connection checkpoints and removes the WAL files, and
+    # the database can be moved, which Windows refuses while it is open.
+    db_path = store.db_path
+    assert not db_path.with_name(f"{db_path.name}-wal").exists()
+    moved = db_path.rename(db_path.with_name("moved.db"))
+    moved.rename(db_path)
+    assert ReviewStore.for_client("closing_client") is not store
+    assert [item.txn.id for item in store.list_items()] == ["txn-1", "txn-2", "txn-3"]
+    store.close()
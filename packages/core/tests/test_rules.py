@@ -0,0 +1,101 @@
+"""Tests for rule compilation and caching."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+from accountantiq_core import add_rule, compile_rules, load_compiled_rules, load_rules
+from accountantiq_core import rules as rules_module
+from accountantiq_core.cache import FileKey
+from accountantiq_schemas import BankTxn, RuleDefinition
+
+
+def _txn(description: str) -> BankTxn:
+    return BankTxn(
+        id=f"txn-{description}",
+        date=date(2025, 1, 1),
+        amount=-10.0,
+        direction="debit",
+        description_raw=description.upper(),
+        description_clean=description,
+        account_id="TEST",
+    )
+
+
+def _rule(name: str, pattern: str, nominal: str) -> RuleDefinition:
+    return RuleDefinition(name=name, pattern=pattern, nominal=nominal, tax_code="T1")
+
+
+def test_compiled_rules_respect_rule_order() -> None:
+    compiled = compile_rules(
+        [
+            _rule("Marketplace", "marketplace", "5000"),
+            _rule("Amazon", "(?i)amazon", "5100"),
+        ]
+    )
+
+    marketplace = compiled.match(_txn("amazon eu marketplace"))
+    amazon = compiled.match(_txn("amazon prime"))
+
+    assert marketplace is not None and marketplace.nominal == "5000"
+    assert amazon is not None and amazon.nominal == "5100"
+    assert compiled.match(_txn("coffee roasters")) is None
+    assert compiled.any_pattern is not None
+
+
+def test_compiled_rules_skip_union_for_grouped_patterns() -> None:
+    compiled = compile_rules(
+        [
+            _rule("Repeat", r"(ab)\1", "5000"),
+            _rule("Coffee", "coffee", "7400"),
+        ]
+    )
+
+    assert compiled.any_pattern is None
+    repeat = compiled.match(_txn("abab ltd"))
+    assert repeat is not None and repeat.nominal == "5000"
+    assert compiled.match(_txn("ab coffee")) is not None
+
+
+def test_load_compiled_rules_refreshes_after_rules_change() -> None:
+    client_slug = "rules_cache_client"
+    assert load_compiled_rules(client_slug).rules == ()
+
+    add_rule(client_slug, _rule("Amazon", "amazon", "5000"))
+    first = load_compiled_rules(client_slug)
+    assert load_compiled_rules(client_slug) is first
+
+    add_rule(client_slug, _rule("Coffee", "coffee", "7400"))
+    refreshed = load_compiled_rules(client_slug)
+    assert [rule.name for rule in refreshed.rules] == ["Amazon", "Coffee"]
+
+
+def test_load_rules_returns_independent_lists() -> None:
+    client_slug = "rules_list_client"
+    add_rule(client_slug, _rule("Amazon", "amazon", "5000"))
+
+    first = load_rules(client_slug)
+    first.append(_rule("Local", "local", "7400"))
+
+    assert [rule.name for rule in load_rules(client_slug)] == ["Amazon"]
+
+
+def test_save_refreshes_caches_when_file_key_is_unchanged(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Simulate a coarse-mtime filesystem where a same-size rewrite keeps its key.
+    def coarse_key(path: Path) -> FileKey | None:
+        return (str(path), 0, path.stat().st_size) if path.exists() else None
+
+    monkeypatch.setattr(rules_module, "file_key", coarse_key)
+    client_slug = "coarse_mtime_client"
+    rules_module.save_rules(client_slug, [_rule("AAAA", "amazon", "5000")])
+    assert [rule.name for rule in load_rules(client_slug)] == ["AAAA"]
+    assert load_compiled_rules(client_slug).rules[0].name == "AAAA"
+
+    rules_module.save_rules(client_slug, [_rule("BBBB", "amazon", "5000")])
+
+    assert [rule.name for rule in load_rules(client_slug)] == ["BBBB"]
+    assert load_compiled_rules(client_slug).rules[0].name == "BBBB"